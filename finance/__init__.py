@@ -10,3 +10,6 @@ from .prices import (
     historical_price, get_market_cap
 )
 
+from .profiles import (
+    get_profile, refresh_profiles, get_shares_outstanding
+)
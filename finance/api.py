@@ -0,0 +1,361 @@
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+import traceback
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from .edgar_client import get_facts, CIK
+from .fundamentals import annual_net_income, annual_dividends, calculate_net_income_growth
+
+# Read-only JSON API over the annual series computed by this package.
+# Each ticker's series are built once (SEC EDGAR + Yahoo), stored under
+# .cache/series/ and kept in memory as pre-encoded JSON fragments, so a
+# request only joins bytes and never touches pandas or the network.
+SERIES_DIR = os.getenv(
+    'SERIES_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'series')
+)
+SERIES_TTL = int(os.getenv('SERIES_STORE_TTL', 24 * 3600))  # 1 day
+STALE_RETRY = 5 * 60  # serve a stale series this long before retrying upstream
+KINDS = ('net_income', 'dividends', 'prices')
+MAX_TICKERS = 50
+RESPONSE_CACHE_SIZE = 1024
+MIN_GZIP_SIZE = 512
+TICKER_PATTERN = re.compile(r'^[A-Z0-9.\-]+$')
+
+
+# 0. Helper Functions
+def _clean(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _records(df, value_col, growth_col):
+    return [
+        {'year': int(row['year']), 'date': row['date'].strftime('%Y-%m-%d'),
+         'value': _clean(row[value_col]), 'growth': _clean(row[growth_col])}
+        for _, row in df.iterrows()
+    ]
+
+
+def _price_ranges(ticker):
+    price = yf.download(ticker, progress=False)
+    if price is None or price.empty:
+        return []
+    columns = {}
+    for column in ('Open', 'High', 'Low', 'Close'):
+        data = price[column]
+        if data.ndim > 1:  # newer yfinance returns one column per ticker
+            data = data.iloc[:, 0]
+        columns[column] = data
+    yearly = pd.DataFrame(columns).dropna()
+    yearly = yearly.groupby(yearly.index.year).agg({'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'})
+    return [
+        {'year': int(year), 'low': _clean(row['Low']), 'high': _clean(row['High']),
+         'open': _clean(row['Open']), 'close': _clean(row['Close'])}
+        for year, row in yearly.iterrows()
+    ]
+
+
+# 1. Build and store per-ticker series
+def build_series(ticker):
+    ticker = ticker.upper()
+    facts = get_facts(ticker)
+    if not facts:
+        return None
+
+    df_net_income, _, _ = annual_net_income(facts['facts'])
+    net_income = []
+    if not df_net_income.empty:
+        df_growth = calculate_net_income_growth(df_net_income)
+        net_income = _records(df_growth, 'net_income', 'net_income_growth')
+
+    df_dividends, _, _ = annual_dividends(facts['facts'])
+    dividends = []
+    if not df_dividends.empty:
+        df_dividends = df_dividends.copy()
+        df_dividends['dividend_growth'] = df_dividends['dividends'].pct_change() * 100
+        df_dividends = df_dividends.replace([np.inf, -np.inf], np.nan)
+        dividends = _records(df_dividends, 'dividends', 'dividend_growth')
+
+    return {
+        'ticker': ticker,
+        'entity': facts.get('entityName'),
+        'updated': time.time(),
+        'net_income': net_income,
+        'dividends': dividends,
+        'prices': _price_ranges(ticker),
+    }
+
+
+def load_series(ticker, refresh=False):
+    ticker = ticker.upper()
+    path = os.path.join(SERIES_DIR, f'{ticker}.json')
+    stored = None
+    try:
+        with open(path, 'r') as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        pass
+    if stored is not None and not refresh and time.time() - stored.get('updated', 0) < SERIES_TTL:
+        return stored
+
+    try:
+        series = build_series(ticker)
+    except Exception:
+        if stored is None:
+            raise
+        return stored  # upstream unavailable: keep serving the stale series
+    if series is not None:
+        os.makedirs(SERIES_DIR, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(series, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    return series
+
+
+def encode_series(series):
+    """Pre-encode each endpoint's JSON fragment for one ticker."""
+    if series is None:
+        return {kind: b'null' for kind in KINDS + ('series',)}
+    fragments = {
+        kind: json.dumps({'ticker': series['ticker'], 'entity': series['entity'], kind: series[kind]},
+                         separators=(',', ':')).encode()
+        for kind in KINDS
+    }
+    fragments['series'] = json.dumps(series, separators=(',', ':')).encode()
+    return fragments
+
+
+def _load_fragments(ticker):
+    series = load_series(ticker)
+    now = time.time()
+    updated = series['updated'] if series is not None else now
+    if now - updated >= SERIES_TTL:
+        updated = now - SERIES_TTL + STALE_RETRY  # stale fallback, retry upstream later
+    return updated, encode_series(series)
+
+
+def _known(ticker):
+    return TICKER_PATTERN.match(ticker) is not None and ticker in CIK
+
+
+def _etag_matches(etag, if_none_match):
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    # If-None-Match uses weak comparison, so a W/ prefix is ignored
+    return '*' in tags or etag in (tag[2:] if tag.startswith('W/') else tag for tag in tags)
+
+
+def _accepts_gzip(accept_encoding):
+    qualities = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding.strip().lower()] = q
+    # An explicit gzip entry (including q=0) overrides the * wildcard
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+
+
+# 2. HTTP service
+class SeriesServer:
+    def __init__(self):
+        self.fragments = {}                  # ticker -> (updated at, {kind: bytes})
+        self.responses = OrderedDict()       # (kind, tickers) -> (expires, etag, body, gzip body)
+        self._pending = {}                   # ticker -> Future while loading
+
+    async def fragments_for(self, ticker):
+        loaded = self.fragments.get(ticker)
+        if loaded is not None and time.time() - loaded[0] < SERIES_TTL:
+            return loaded[1]
+        # Concurrent misses for one ticker share a single load
+        pending = self._pending.get(ticker)
+        if pending is None:
+            pending = asyncio.ensure_future(asyncio.to_thread(_load_fragments, ticker))
+            self._pending[ticker] = pending
+            try:
+                self.fragments[ticker] = await pending
+            finally:
+                del self._pending[ticker]
+        return (await pending)[1]
+
+    async def warm(self, tickers):
+        await asyncio.gather(*(self.fragments_for(t) for t in {t.upper() for t in tickers} if _known(t)))
+
+    async def response_for(self, kind, tickers):
+        key = (kind, tickers)
+        cached = self.responses.get(key)
+        if cached is not None and time.time() < cached[0]:
+            self.responses.move_to_end(key)
+            return cached[1:]
+
+        # Unknown tickers are answered with null and never reach disk or the fragment cache
+        known = [t for t in tickers if _known(t)]
+        loaded = dict(zip(known, await asyncio.gather(*(self.fragments_for(t) for t in known))))
+        parts = [b'"' + t.encode() + b'":' + (loaded[t][kind] if t in loaded else b'null') for t in tickers]
+        # A batched payload expires with the oldest series it was built from
+        expires = min((self.fragments[t][0] for t in known), default=time.time()) + SERIES_TTL
+        body = b'{' + b','.join(parts) + b'}'
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        gz_body = gzip.compress(body, compresslevel=6) if len(body) >= MIN_GZIP_SIZE else None
+        cached = (expires, etag, body, gz_body)
+
+        self.responses[key] = cached
+        if len(self.responses) > RESPONSE_CACHE_SIZE:
+            self.responses.popitem(last=False)
+        return cached[1:]
+
+    async def handle(self, method, target, headers):
+        if method not in ('GET', 'HEAD'):
+            return _error(405, 'method not allowed')
+
+        try:
+            url = urlsplit(target)
+            query = parse_qs(url.query)
+        except ValueError:
+            return _error(400, 'bad request')
+        path = url.path.rstrip('/')
+        if path == '/health':
+            return 200, {}, b'{"status":"ok"}'
+        kind = path.rsplit('/', 1)[-1]
+        if not path.startswith('/v1/') or kind not in KINDS + ('series',):
+            return _error(404, 'not found')
+
+        tickers = [t.strip().upper() for v in query.get('tickers', []) for t in v.split(',') if t.strip()]
+        if not tickers:
+            return _error(400, 'tickers query parameter is required')
+        if len(tickers) > MAX_TICKERS:
+            return _error(400, f'at most {MAX_TICKERS} tickers per request')
+        invalid = [t for t in tickers if TICKER_PATTERN.match(t) is None]
+        if invalid:
+            return _error(400, f'invalid ticker: {invalid[0]}')
+
+        try:
+            etag, body, gz_body = await self.response_for(kind, tuple(dict.fromkeys(tickers)))
+        except Exception:
+            return _error(502, 'upstream data unavailable')
+        out_headers = {'Cache-Control': 'public, max-age=300', 'Vary': 'Accept-Encoding'}
+        if gz_body is not None and _accepts_gzip(headers.get('accept-encoding', '')):
+            etag = etag[:-1] + '-gz"'  # each encoding is a distinct representation
+            out_headers['Content-Encoding'] = 'gzip'
+            body = gz_body
+        out_headers['ETag'] = etag
+        if _etag_matches(etag, headers.get('if-none-match')):
+            return 304, out_headers, b''
+        return 200, out_headers, body
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    writer.write(_encode_response(*_error(400, 'bad request'), keep_alive=False))
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(':')
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+
+                # Requests carry no meaningful body; discard it so the next request parses cleanly
+                if 'transfer-encoding' in headers:
+                    keep_alive = False
+                try:
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError
+                    if length:
+                        await reader.readexactly(length)
+                except ValueError:
+                    writer.write(_encode_response(*_error(400, 'bad request'), keep_alive=False))
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                try:
+                    status, out_headers, body = await self.handle(method, target, headers)
+                except Exception:
+                    traceback.print_exc()
+                    status, out_headers, body = _error(500, 'internal server error')
+                writer.write(_encode_response(status, out_headers, body, keep_alive, head_only=method == 'HEAD'))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+
+_REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            500: 'Internal Server Error', 502: 'Bad Gateway'}
+
+
+def _error(status, message):
+    return status, {}, json.dumps({'error': message}).encode()
+
+
+def _encode_response(status, headers, body, keep_alive=True, head_only=False):
+    lines = [f'HTTP/1.1 {status} {_REASONS[status]}']
+    if status != 304:
+        lines.append('Content-Type: application/json')
+        lines.append(f'Content-Length: {len(body)}')
+    lines.extend(f'{name}: {value}' for name, value in headers.items())
+    lines.append('Connection: keep-alive' if keep_alive else 'Connection: close')
+    head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+    return head if head_only or status == 304 else head + body
+
+
+async def serve(host='127.0.0.1', port=8000, warm=()):
+    server = SeriesServer()
+    if warm:
+        await server.warm(warm)
+    tcp_server = await asyncio.start_server(server.serve_connection, host, port)
+    print(f'Serving fundamentals API on http://{host}:{port}')
+    async with tcp_server:
+        await tcp_server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Read-only JSON API for net income, dividends and price ranges.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--warm', nargs='*', default=[], help='tickers to load before accepting requests')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.warm))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
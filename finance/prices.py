@@ -1,5 +1,6 @@
 import matplotlib.pyplot as plt
 import yfinance as yf
+from .profiles import get_shares_outstanding
 
 def historical_price(ticker, start=None, end=None, column='Close', scale='linear', ax=None):
     # 주가 다운로드
@@ -37,8 +38,10 @@ def historical_price(ticker, start=None, end=None, column='Close', scale='linear
     return data
 
 def get_market_cap(ticker):
+    shares = get_shares_outstanding(ticker)
+    if shares is None:
+        raise ValueError(f"Shares outstanding not available for {ticker}")
     price = yf.download(ticker)
-    shares = yf.Ticker(ticker).info['sharesOutstanding']
     market_cap = price['Close'] * shares
     
     return market_cap
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import yfinance as yf
+
+# Local company-profile store. Yahoo's Ticker.info is slow and rate limited,
+# so only the fields the app and notebooks use are kept, keyed by ticker.
+PROFILE_PATH = os.getenv(
+    'PROFILE_STORE_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'profiles.json')
+)
+PROFILE_TTL = int(os.getenv('PROFILE_STORE_TTL', 7 * 24 * 3600))  # 1 week
+FAILED_TTL = 15 * 60  # wait before asking Yahoo again after a failed fetch
+FETCH_WORKERS = 8     # concurrent Ticker.info requests during a refresh
+
+# yfinance .info key -> short key stored on disk
+PROFILE_FIELDS = {
+    'longBusinessSummary': 'summary',
+    'sector': 'sector',
+    'sharesOutstanding': 'shares',
+    'currency': 'currency',
+}
+
+_profiles = None  # in-memory copy of the store, loaded once per process
+_failed = {}      # ticker -> time of the last failed fetch (not persisted)
+_lock = threading.RLock()  # Streamlit runs each session in its own thread
+
+
+def _load_profiles():
+    global _profiles
+    with _lock:
+        if _profiles is None:
+            try:
+                with open(PROFILE_PATH, 'r') as f:
+                    _profiles = json.load(f)
+            except (OSError, ValueError):
+                _profiles = {}
+        return _profiles
+
+
+def _save_profiles():
+    with _lock:
+        snapshot = dict(_profiles)
+        directory = os.path.dirname(PROFILE_PATH)
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False) as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+        os.replace(f.name, PROFILE_PATH)
+
+
+def _is_fresh(profile, now):
+    return profile is not None and now - profile.get('fetched', 0) < PROFILE_TTL
+
+
+def _fetch_info(yf_tickers, ticker):
+    try:
+        info = yf_tickers.tickers[ticker].info or {}
+    except Exception:
+        return None
+    # Rate-limited responses come back empty; keep only the fields that are present
+    fields = {short: info[key] for key, short in PROFILE_FIELDS.items() if info.get(key) is not None}
+    return fields or None
+
+
+# 1. Batched refresh
+def refresh_profiles(tickers, force=False):
+    profiles = _load_profiles()
+    now = time.time()
+    tickers = [t.upper() for t in tickers]
+    with _lock:
+        stale = [
+            t for t in tickers
+            if force or (not _is_fresh(profiles.get(t), now) and now - _failed.get(t, 0) >= FAILED_TTL)
+        ]
+
+    if stale:
+        yf_tickers = yf.Tickers(' '.join(stale))
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(stale))) as pool:
+            fetched = dict(zip(stale, pool.map(lambda t: _fetch_info(yf_tickers, t), stale)))
+        with _lock:
+            for ticker, fields in fetched.items():
+                if fields is None:
+                    _failed[ticker] = now  # keep the previous (stale) profile
+                    continue
+                # Merge so a partial response never erases a known value
+                profile = {**profiles.get(ticker, {}), **fields}
+                if 'shares' not in fields:
+                    _failed[ticker] = now  # partial response: leave it stale and retry later
+                else:
+                    profile['fetched'] = now
+                    _failed.pop(ticker, None)
+                profiles[ticker] = profile
+            if any(fields is not None for fields in fetched.values()):
+                _save_profiles()
+
+    with _lock:
+        return {t: profiles.get(t) for t in tickers}
+
+
+# 2. Single-ticker read
+def get_profile(ticker, refresh=True):
+    ticker = ticker.upper()
+    profile = _load_profiles().get(ticker)
+    if refresh and not _is_fresh(profile, time.time()):
+        profile = refresh_profiles([ticker])[ticker]
+    return profile
+
+
+def get_shares_outstanding(ticker):
+    profile = get_profile(ticker)
+    if profile is None:
+        return None
+    return profile.get('shares')
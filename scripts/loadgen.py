@@ -0,0 +1,57 @@
+import argparse
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+# Minimal keep-alive HTTP load generator for the fundamentals API (finance.api).
+# Usage: python scripts/loadgen.py "http://127.0.0.1:8000/v1/net_income?tickers=AAPL" -c 32 -d 10
+
+
+async def _worker(host, port, request, deadline, counts):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            writer.write(request)
+            await writer.drain()
+            head = await reader.readuntil(b'\r\n\r\n')
+            status = int(head[9:12])
+            length = 0
+            for line in head.split(b'\r\n'):
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            if length:
+                await reader.readexactly(length)
+            counts[status] = counts.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(url, concurrency=32, duration=10.0, headers=()):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    target = parts.path + (f'?{parts.query}' if parts.query else '')
+    lines = [f'GET {target} HTTP/1.1', f'Host: {host}:{port}', *headers]
+    request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    counts = {}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(_worker(host, port, request, deadline, counts) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return sum(counts.values()) / elapsed, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure requests per second against the fundamentals API.')
+    parser.add_argument('url')
+    parser.add_argument('-c', '--concurrency', type=int, default=32)
+    parser.add_argument('-d', '--duration', type=float, default=10.0)
+    parser.add_argument('-H', '--header', action='append', default=[], help="extra header, e.g. 'Accept-Encoding: gzip'")
+    args = parser.parse_args()
+
+    rps, counts = asyncio.run(run(args.url, args.concurrency, args.duration, args.header))
+    print(f'{rps:,.0f} requests/sec  (status counts: {counts})')
+
+
+if __name__ == '__main__':
+    main()
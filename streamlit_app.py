@@ -5,8 +5,7 @@ import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
 
-import yfinance as yf
-from finance import get_facts, annual_net_income, annual_dividends, historical_price
+from finance import get_facts, annual_net_income, annual_dividends, historical_price, get_profile
 from finance.fundamentals import calculate_net_income_growth
 
 # Helper function to format large numbers
@@ -167,7 +166,7 @@ with st.sidebar:
 with st.spinner(f"Analyzing {selected_ticker}..."):
     # Fetch data with caching
     facts = get_facts(selected_ticker)
-    facts_yf = yf.Ticker(selected_ticker)
+    profile = get_profile(selected_ticker)
 
 # Error handling for data fetching
 if not facts:
@@ -182,9 +181,9 @@ else:
     st.header(f"🏢 {facts['entityName']}")
     
     # Business summary with error handling
-    if facts_yf and facts_yf.info and 'longBusinessSummary' in facts_yf.info:
+    if profile and profile.get('summary'):
         try:
-            business_summary = facts_yf.info['longBusinessSummary']
+            business_summary = profile['summary']
             sentences = business_summary.split('. ')
             if len(sentences) >= 2:
                 st.markdown(f"""
@@ -0,0 +1,281 @@
+import asyncio
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance import api
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+import loadgen  # noqa: E402
+
+
+def fake_series(ticker, years=30):
+    return {
+        'ticker': ticker,
+        'entity': f'{ticker} Inc.',
+        'updated': time.time(),
+        'net_income': [{'year': 1995 + i, 'date': f'{1995 + i}-09-30', 'value': 1e9 * (i + 1), 'growth': 10.0}
+                       for i in range(years)],
+        'dividends': [],
+        'prices': [],
+    }
+
+
+@pytest.fixture
+def builds(monkeypatch, tmp_path):
+    """Stub build_series, point the store at tmp_path and record every build."""
+    calls = []
+
+    def build_series(ticker):
+        calls.append(ticker)
+        time.sleep(0.05)  # widen the window for concurrent misses
+        return fake_series(ticker)
+
+    monkeypatch.setattr(api, 'build_series', build_series)
+    monkeypatch.setattr(api, 'SERIES_DIR', str(tmp_path))
+    monkeypatch.setattr(api, 'CIK', {'AAPL': 320193, 'MSFT': 789019, 'BRK.B': 1067983})
+    return calls
+
+
+def get(server, target, **headers):
+    headers = {name.replace('_', '-'): value for name, value in headers.items()}
+    return asyncio.run(server.handle('GET', target, headers))
+
+
+def test_batched_response_keyed_by_ticker(builds):
+    server = api.SeriesServer()
+    status, _, body = get(server, '/v1/net_income?tickers=aapl,MSFT,BRK.B,AAPL')
+    payload = json.loads(body)
+    assert status == 200
+    assert list(payload) == ['AAPL', 'MSFT', 'BRK.B']
+    assert payload['MSFT']['ticker'] == 'MSFT' and 'dividends' not in payload['MSFT']
+    assert sorted(builds) == ['AAPL', 'BRK.B', 'MSFT']
+
+
+def test_unknown_ticker_is_null_and_not_memoized(builds):
+    server = api.SeriesServer()
+    status, _, body = get(server, '/v1/series?tickers=AAPL,JUNK0,JUNK1')
+    assert status == 200
+    assert json.loads(body)['JUNK0'] is None
+    assert list(server.fragments) == ['AAPL']
+    assert builds == ['AAPL']
+
+
+@pytest.mark.parametrize('tickers', ['../../ETC/X', 'AAPL,A%2FB', 'A B'])
+def test_invalid_ticker_rejected_before_disk(builds, tickers):
+    server = api.SeriesServer()
+    status, _, _ = get(server, f'/v1/series?tickers={tickers}')
+    assert status == 400
+    assert builds == [] and server.fragments == {}
+
+
+@pytest.mark.parametrize('accept_encoding', ['gzip;q=0', 'gzip;q=0, deflate', 'identity', '*;q=0', '*, gzip;q=0'])
+def test_gzip_refused(builds, accept_encoding):
+    server = api.SeriesServer()
+    _, headers, body = get(server, '/v1/series?tickers=AAPL,MSFT', accept_encoding=accept_encoding)
+    assert 'Content-Encoding' not in headers
+    assert json.loads(body)['AAPL']['ticker'] == 'AAPL'
+
+
+@pytest.mark.parametrize('accept_encoding', ['GZIP', 'deflate, gzip;q=0.5', '*', 'br;q=1.0, *;q=0.1'])
+def test_gzip_accepted(builds, accept_encoding):
+    server = api.SeriesServer()
+    _, headers, _ = get(server, '/v1/series?tickers=AAPL,MSFT', accept_encoding=accept_encoding)
+    assert headers['Content-Encoding'] == 'gzip'
+
+
+def test_malformed_target_is_400(builds):
+    assert get(api.SeriesServer(), '//[x')[0] == 400
+
+
+def test_request_errors(builds):
+    server = api.SeriesServer()
+    assert get(server, '/v1/series')[0] == 400
+    assert get(server, '/v1/unknown?tickers=AAPL')[0] == 404
+    assert get(server, '/v1/series?tickers=' + ','.join(f'T{i}' for i in range(51)))[0] == 400
+    assert asyncio.run(server.handle('POST', '/v1/series?tickers=AAPL', {}))[0] == 405
+    assert get(server, '/health')[0] == 200
+
+
+def test_gzip_only_when_accepted(builds):
+    server = api.SeriesServer()
+    _, plain_headers, plain = get(server, '/v1/series?tickers=AAPL,MSFT')
+    _, gz_headers, compressed = get(server, '/v1/series?tickers=AAPL,MSFT', accept_encoding='gzip, deflate')
+    assert 'Content-Encoding' not in plain_headers
+    assert gz_headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed) == plain
+    assert gz_headers['ETag'] != plain_headers['ETag']
+
+
+@pytest.mark.parametrize('if_none_match', ['{etag}', '"other", {etag}', 'W/{etag}', '*'])
+def test_if_none_match_returns_304(builds, if_none_match):
+    server = api.SeriesServer()
+    _, headers, _ = get(server, '/v1/dividends?tickers=AAPL')
+    status, _, body = get(server, '/v1/dividends?tickers=AAPL',
+                          if_none_match=if_none_match.format(etag=headers['ETag']))
+    assert status == 304 and body == b''
+
+
+def test_if_none_match_is_not_a_substring_check(builds):
+    server = api.SeriesServer()
+    _, headers, _ = get(server, '/v1/dividends?tickers=AAPL')
+    etag = headers['ETag']
+    assert get(server, '/v1/dividends?tickers=AAPL', if_none_match=etag[:-1] + 'x"' + etag)[0] == 200
+    assert get(server, '/v1/dividends?tickers=AAPL', if_none_match=etag.strip('"'))[0] == 200
+
+
+def test_concurrent_misses_share_one_load(builds):
+    server = api.SeriesServer()
+
+    async def burst():
+        return await asyncio.gather(*(server.handle('GET', '/v1/series?tickers=AAPL,MSFT', {}) for _ in range(10)))
+
+    responses = asyncio.run(burst())
+    assert {status for status, _, _ in responses} == {200}
+    assert sorted(builds) == ['AAPL', 'MSFT']
+
+
+def test_cold_batch_loads_tickers_concurrently(builds, monkeypatch):
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def build_series(ticker):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        return fake_series(ticker)
+
+    monkeypatch.setattr(api, 'build_series', build_series)
+    assert get(api.SeriesServer(), '/v1/series?tickers=AAPL,MSFT,BRK.B')[0] == 200
+    assert peak[0] > 1
+
+
+def test_expired_series_is_rebuilt(builds, monkeypatch):
+    server = api.SeriesServer()
+    get(server, '/v1/series?tickers=AAPL')
+    assert builds == ['AAPL']
+    get(server, '/v1/series?tickers=AAPL')
+    assert builds == ['AAPL']  # served from memory
+
+    later = time.time() + api.SERIES_TTL + 1
+    monkeypatch.setattr(api.time, 'time', lambda: later)
+    get(server, '/v1/series?tickers=AAPL')
+    assert builds == ['AAPL', 'AAPL']
+
+
+def test_series_is_read_from_disk_store(builds):
+    get(api.SeriesServer(), '/v1/series?tickers=AAPL')
+    assert os.path.exists(os.path.join(api.SERIES_DIR, 'AAPL.json'))
+    get(api.SeriesServer(), '/v1/series?tickers=AAPL')  # new process, same store
+    assert builds == ['AAPL']
+
+
+def test_stale_series_served_when_upstream_fails(builds, monkeypatch):
+    stale = fake_series('AAPL')
+    stale['updated'] = time.time() - api.SERIES_TTL - 60
+    with open(os.path.join(api.SERIES_DIR, 'AAPL.json'), 'w') as f:
+        json.dump(stale, f)
+
+    def build_series(ticker):
+        raise ConnectionError('EDGAR unreachable')
+
+    monkeypatch.setattr(api, 'build_series', build_series)
+    server = api.SeriesServer()
+    status, _, body = get(server, '/v1/net_income?tickers=AAPL')
+    assert status == 200
+    assert json.loads(body)['AAPL']['net_income'] == stale['net_income']
+    # Retried after STALE_RETRY rather than on every request
+    assert time.time() - server.fragments['AAPL'][0] < api.SERIES_TTL
+
+    assert get(server, '/v1/net_income?tickers=MSFT')[0] == 502  # nothing on disk to fall back to
+
+
+def test_price_ranges_use_ohlc_columns(monkeypatch):
+    index = pd.to_datetime(['2023-01-03', '2023-06-01', '2023-12-29', '2024-01-02'])
+    price = pd.DataFrame({
+        ('Open', 'AAPL'): [10.0, 20.0, 30.0, 40.0],
+        ('High', 'AAPL'): [15.0, 50.0, 35.0, 45.0],
+        ('Low', 'AAPL'): [5.0, 18.0, 28.0, 38.0],
+        ('Close', 'AAPL'): [12.0, 22.0, 32.0, np.nan],
+    }, index=index)
+    monkeypatch.setattr(api.yf, 'download', lambda ticker, progress=False: price)
+    assert api._price_ranges('AAPL') == [{'year': 2023, 'low': 5.0, 'high': 50.0, 'open': 10.0, 'close': 32.0}]
+
+
+async def _raw_exchange(server, payload):
+    tcp_server = await asyncio.start_server(server.serve_connection, '127.0.0.1', 0)
+    port = tcp_server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(payload)
+    await writer.drain()
+    data = await asyncio.wait_for(reader.read(), timeout=5)
+    writer.close()
+    tcp_server.close()
+    await tcp_server.wait_closed()
+    return data
+
+
+def test_keep_alive_discards_request_body(builds):
+    payload = (b'GET /health HTTP/1.1\r\nHost: x\r\nContent-Length: 11\r\n\r\nhello world'
+               b'GET /v1/series?tickers=AAPL HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n')
+    data = asyncio.run(_raw_exchange(api.SeriesServer(), payload))
+    assert data.count(b'HTTP/1.1 200 OK') == 2
+    assert b'HTTP/1.1 400' not in data
+
+
+def test_malformed_request_line(builds):
+    data = asyncio.run(_raw_exchange(api.SeriesServer(), b'garbage\r\n\r\n'))
+    assert data.startswith(b'HTTP/1.1 400 Bad Request')
+
+
+def test_malformed_target_over_connection(builds):
+    payload = b'GET //[x HTTP/1.1\r\n\r\nGET /health HTTP/1.1\r\nConnection: close\r\n\r\n'
+    data = asyncio.run(_raw_exchange(api.SeriesServer(), payload))
+    assert data.startswith(b'HTTP/1.1 400 Bad Request')
+    assert b'HTTP/1.1 200 OK' in data
+
+
+def test_unexpected_error_is_500(builds, monkeypatch):
+    async def handle(method, target, headers):
+        raise RuntimeError('boom')
+
+    server = api.SeriesServer()
+    monkeypatch.setattr(server, 'handle', handle)
+    data = asyncio.run(_raw_exchange(server, b'GET /health HTTP/1.1\r\nConnection: close\r\n\r\n'))
+    assert data.startswith(b'HTTP/1.1 500 Internal Server Error')
+
+
+def test_head_and_304_have_no_body(builds):
+    server = api.SeriesServer()
+    _, headers, _ = get(server, '/v1/series?tickers=AAPL')
+    payload = (b'HEAD /v1/series?tickers=AAPL HTTP/1.1\r\n\r\n'
+               b'GET /v1/series?tickers=AAPL HTTP/1.1\r\nIf-None-Match: ' + headers['ETag'].encode()
+               + b'\r\nConnection: close\r\n\r\n')
+    data = asyncio.run(_raw_exchange(server, payload))
+    head, rest = data.split(b'\r\n\r\n', 1)
+    assert head.startswith(b'HTTP/1.1 200 OK')
+    assert rest.startswith(b'HTTP/1.1 304 Not Modified') and rest.endswith(b'\r\n\r\n')
+
+
+def test_loadgen_counts_responses(builds):
+    async def bench():
+        server = api.SeriesServer()
+        tcp_server = await asyncio.start_server(server.serve_connection, '127.0.0.1', 0)
+        port = tcp_server.sockets[0].getsockname()[1]
+        result = await loadgen.run(f'http://127.0.0.1:{port}/v1/net_income?tickers=AAPL', concurrency=4, duration=0.3)
+        tcp_server.close()
+        await tcp_server.wait_closed()
+        return result
+
+    rps, counts = asyncio.run(bench())
+    assert rps > 0 and set(counts) == {200}
@@ -0,0 +1,179 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from finance import prices, profiles
+
+FULL_INFO = {'longBusinessSummary': 'Makes phones. Sells services.', 'sector': 'Technology',
+             'sharesOutstanding': 15_000_000_000, 'currency': 'USD', 'unused': 1}
+
+
+class FakeYahoo:
+    """Stands in for yf.Tickers; info[ticker] is a dict, or an exception to raise."""
+
+    def __init__(self):
+        self.info = {}
+        self.calls = []
+        self.delay = 0
+
+    def Tickers(self, names):
+        return type('Tickers', (), {'tickers': {n: FakeTicker(self, n) for n in names.split()}})()
+
+
+class FakeTicker:
+    def __init__(self, yahoo, ticker):
+        self.yahoo, self.ticker = yahoo, ticker
+
+    @property
+    def info(self):
+        self.yahoo.calls.append(self.ticker)
+        time.sleep(self.yahoo.delay)
+        info = self.yahoo.info.get(self.ticker, {})
+        if isinstance(info, Exception):
+            raise info
+        return info
+
+
+@pytest.fixture
+def yahoo(monkeypatch, tmp_path):
+    fake = FakeYahoo()
+    monkeypatch.setattr(profiles.yf, 'Tickers', fake.Tickers)
+    monkeypatch.setattr(profiles, 'PROFILE_PATH', str(tmp_path / 'profiles.json'))
+    monkeypatch.setattr(profiles, '_profiles', None)
+    monkeypatch.setattr(profiles, '_failed', {})
+    return fake
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [time.time()]
+    monkeypatch.setattr(profiles.time, 'time', lambda: now[0])
+    return now
+
+
+def test_keeps_only_used_fields(yahoo):
+    yahoo.info['AAPL'] = FULL_INFO
+    profile = profiles.get_profile('aapl')
+    assert set(profile) == {'summary', 'sector', 'shares', 'currency', 'fetched'}
+    assert profiles.get_shares_outstanding('AAPL') == 15_000_000_000
+
+
+def test_fresh_profile_is_served_from_memory(yahoo):
+    yahoo.info['AAPL'] = FULL_INFO
+    profiles.get_profile('AAPL')
+    profiles.get_profile('AAPL')
+    assert yahoo.calls == ['AAPL']
+
+
+def test_disk_round_trip(yahoo):
+    yahoo.info['AAPL'] = FULL_INFO
+    profiles.refresh_profiles(['AAPL'])
+    directory = os.path.dirname(profiles.PROFILE_PATH)
+    assert os.listdir(directory) == ['profiles.json']  # temp file replaced atomically
+    with open(profiles.PROFILE_PATH) as f:
+        assert json.load(f)['AAPL']['shares'] == 15_000_000_000
+
+    profiles._profiles = None  # new process, same store
+    assert profiles.get_shares_outstanding('AAPL') == 15_000_000_000
+    assert yahoo.calls == ['AAPL']
+
+
+def test_expired_profile_is_refetched(yahoo, clock):
+    yahoo.info['AAPL'] = FULL_INFO
+    profiles.get_profile('AAPL')
+    clock[0] += profiles.PROFILE_TTL + 1
+    profiles.get_profile('AAPL')
+    assert yahoo.calls == ['AAPL', 'AAPL']
+
+
+def test_force_bypasses_freshness(yahoo):
+    yahoo.info['AAPL'] = FULL_INFO
+    profiles.refresh_profiles(['AAPL'])
+    profiles.refresh_profiles(['AAPL'], force=True)
+    assert yahoo.calls == ['AAPL', 'AAPL']
+
+
+@pytest.mark.parametrize('failure', [{}, RuntimeError('429 Too Many Requests')])
+def test_failed_fetch_backs_off(yahoo, clock, failure):
+    yahoo.info['ZZZ'] = failure
+    assert profiles.get_profile('ZZZ') is None
+    assert profiles.get_profile('ZZZ') is None
+    assert yahoo.calls == ['ZZZ']
+    assert not os.path.exists(profiles.PROFILE_PATH)
+
+    clock[0] += profiles.FAILED_TTL + 1
+    yahoo.info['ZZZ'] = FULL_INFO
+    assert profiles.get_shares_outstanding('ZZZ') == 15_000_000_000
+
+
+def test_failed_refresh_keeps_previous_profile(yahoo, clock):
+    yahoo.info['AAPL'] = FULL_INFO
+    profiles.get_profile('AAPL')
+    clock[0] += profiles.PROFILE_TTL + 1
+    yahoo.info['AAPL'] = {}
+    assert profiles.get_shares_outstanding('AAPL') == 15_000_000_000
+
+
+def test_partial_response_merges_and_stays_stale(yahoo, clock):
+    yahoo.info['AAPL'] = FULL_INFO
+    profiles.get_profile('AAPL')
+    clock[0] += profiles.PROFILE_TTL + 1
+
+    yahoo.info['AAPL'] = {'longBusinessSummary': 'New summary.'}
+    profile = profiles.get_profile('AAPL')
+    assert profile['summary'] == 'New summary.'
+    assert profile['shares'] == 15_000_000_000  # not erased by the partial response
+    assert not profiles._is_fresh(profile, clock[0])
+
+    profiles.get_profile('AAPL')
+    assert yahoo.calls == ['AAPL', 'AAPL']  # backing off, not hammering Yahoo
+
+    clock[0] += profiles.FAILED_TTL + 1
+    yahoo.info['AAPL'] = dict(FULL_INFO, sharesOutstanding=16_000_000_000)
+    assert profiles.get_shares_outstanding('AAPL') == 16_000_000_000
+
+
+def test_partial_response_without_shares_for_new_ticker(yahoo):
+    yahoo.info['NEW'] = {'longBusinessSummary': 'Only a summary.'}
+    profile = profiles.get_profile('NEW')
+    assert profile['summary'] == 'Only a summary.'
+    assert profiles.get_shares_outstanding('NEW') is None
+    assert yahoo.calls == ['NEW']
+
+
+def test_refresh_fetches_tickers_concurrently(yahoo):
+    tickers = [f'T{i}' for i in range(8)]
+    for t in tickers:
+        yahoo.info[t] = FULL_INFO
+    yahoo.delay = 0.1
+    start = time.perf_counter()
+    result = profiles.refresh_profiles(tickers)
+    assert time.perf_counter() - start < 0.5
+    assert all(result[t]['shares'] == 15_000_000_000 for t in tickers)
+
+
+def test_concurrent_sessions_do_not_corrupt_store(yahoo):
+    for i in range(8):
+        for j in range(10):
+            yahoo.info[f'T{i}{j}'] = FULL_INFO
+    threads = [threading.Thread(target=profiles.refresh_profiles, args=([f'T{i}{j}' for j in range(10)],))
+               for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    with open(profiles.PROFILE_PATH) as f:
+        assert len(json.load(f)) == 80
+
+
+def test_market_cap_without_shares_raises(yahoo, monkeypatch):
+    def download(ticker):
+        raise AssertionError('price download should not run without shares')
+
+    monkeypatch.setattr(prices.yf, 'download', download)
+    yahoo.info['ZZZ'] = {}
+    with pytest.raises(ValueError, match='ZZZ'):
+        prices.get_market_cap('ZZZ')